@@ -1,46 +1,57 @@
-import json
-from jinja2 import Template
-import re
+import sys
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pathlib import Path
 
-def generate_router_id(router_name):
+# Lecture JSON, router-id et rendu/écriture partagés avec les autres
+# générateurs (codes_rip)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "codes_rip"))
+from topology_common import generate_router_id, read_json_file, render_configs
+
+# Mêmes options d'Environment que pour le template RIP (cfg_generation.py)
+_ENV = Environment(
+    loader=FileSystemLoader(Path(__file__).parent),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_TEMPLATE = _ENV.get_template("router_bgp.j2")
+
+def _render_one(job):
+    """Rend la config BGP d'un couple (nom du routeur, données du routeur)."""
+    router_name, router = job
+    config = _TEMPLATE.render(
+        name=router_name,
+        asn=router["asn"],
+        router_id=generate_router_id(router_name),
+        interfaces=router["interfaces"],
+        neighbors=router["neighbors"]
+    )
+    return router_name, config.encode("utf-8")
+
+
+def cfg_generation_bgp(topology, output_dir=".", workers=None):
+    """Génère les configs BGP à partir d'un fichier topology_bgp.json."""
+    topo = read_json_file(topology)
+
+    cfg_generation_bgp_from_data(topo["routers"], output_dir, workers)
+
+
+def cfg_generation_bgp_from_data(routers, output_dir=".", workers=None):
     """
-    Génère un router-id IPv4 à partir du nom du routeur
-    Ex: R1 -> 1.1.1.1
+    Génère les configs BGP à partir des routeurs déjà en mémoire
+    (ex: topology_data["routers"] renvoyé par extract_topology_bgp).
+
+    Rendu séquentiel par défaut, sur un pool de workers processus sinon
+    (voir render_configs).
     """
-    match = re.search(r"\d+", router_name)
-    if match:
-        n = int(match.group())
-        return f"{n}.{n}.{n}.{n}"
-    else:
-        return "1.1.1.1"
-
-
-def cfg_generation_bgp(topology, output_dir="."):
-    with open(topology) as f:
-        topo = json.load(f)
-
-    routers_data = {r["name"]: r for r in topo["routers"]}
-    
-    template = Template(open("router_bgp.j2").read())
-    
-    for router_name, router in routers_data.items():
-        router_id = generate_router_id(router_name)
-
-        config = template.render(
-            name=router_name,
-            asn=router["asn"],
-            router_id=router_id,
-            interfaces=router["interfaces"],
-            neighbors=router["neighbors"]
-        )
-        
-        output_file = f"{output_dir}/{router_name}.cfg"
-        with open(output_file, "w") as f:
-            f.write(config)
-        
-        print(f"[BGP] Config générée : {output_file}")
-    
-    print("[BGP] Configurations BGP générées avec succès.")
-
-
-cfg_generation_bgp("topology_bgp.json")
\ No newline at end of file
+    routers_data = {r["name"]: r for r in routers}
+
+    count = render_configs(_render_one, routers_data.items(), Path(output_dir), workers)
+
+    print(f"[BGP] {count} configurations BGP générées avec succès.")
+
+
+# Protégé : les processus fils réimportent ce module pour exécuter _render_one
+if __name__ == "__main__":
+    cfg_generation_bgp("topology_bgp.json")
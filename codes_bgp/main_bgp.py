@@ -3,9 +3,34 @@ Script principal pour générer automatiquement les configurations BGP des route
 Workflow : GNS3 project -> topology_bgp.json -> fichiers .cfg BGP
 """
 
+import argparse
+import logging
 from pathlib import Path
-from cfg_generation_bgp import cfg_generation_bgp
-from get_topology_bgp import extract_topology_bgp
+from cfg_generation_bgp import cfg_generation_bgp_from_data
+from get_topology_bgp import BASE_DIR, extract_topology_bgp
+
+# Valeurs par défaut, modifiables en ligne de commande
+DEFAULT_GNS3_PROJECT = r"C:\Users\Hector\Desktop\INSA Lyon\3A-TC\S1\GNS Projet\blank_project\blank_project.gns3"
+DEFAULT_IP_BASE = "2000:1::/64"
+DEFAULT_ASN_BASE = 65000
+
+
+def parse_args():
+    """Lit les paramètres de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Génère les configurations BGP d'un projet GNS3.")
+    parser.add_argument("--project", default=DEFAULT_GNS3_PROJECT,
+                        help="fichier .gns3 du projet")
+    parser.add_argument("--ip-base", default=DEFAULT_IP_BASE,
+                        help="premier sous-réseau IPv6 des liens (défaut: %(default)s)")
+    parser.add_argument("--asn-base", type=int, default=DEFAULT_ASN_BASE,
+                        help="numéro AS de base, R1 reçoit base+1 (défaut: %(default)s)")
+    parser.add_argument("--output", type=Path, default=BASE_DIR,
+                        help="répertoire de sortie de topology_bgp.json et des .cfg (défaut: répertoire du script)")
+    parser.add_argument("--no-json", action="store_true",
+                        help="ne pas écrire topology_bgp.json, générer les .cfg directement")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="rendre les configs sur N processus (défaut: rendu séquentiel)")
+    return parser.parse_args()
 
 
 def main():
@@ -17,18 +42,19 @@ def main():
     2. Génère topology_bgp.json avec l'adressage IP + ASN + voisins
     3. Crée les fichiers .cfg pour chaque routeur avec BGP configuré
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # --- Configuration des paramètres ---
-    base_dir = Path(__file__).parent.absolute()
-    gns3_project_file = r"C:\Users\Hector\Desktop\INSA Lyon\3A-TC\S1\GNS Projet\blank_project\blank_project.gns3"
-    ip_base = "2000:1::/64"
-    asn_base = 65000
+    args = parse_args()
     topology_filename = "topology_bgp.json"
     
     # Extraire la topologie avec ASN et voisins
-    extract_topology_bgp(gns3_project_file, ip_base, asn_base, base_dir, topology_filename)
+    topology = extract_topology_bgp(args.project, args.ip_base, args.asn_base, args.output, topology_filename,
+                                    write_json=not args.no_json)
     
-    # Générer les configurations
-    cfg_generation_bgp(topology_filename, base_dir)
+    # Générer les configurations directement depuis les données en mémoire :
+    # topology_bgp.json (sauf --no-json) est écrit pour consultation mais n'est pas relu
+    cfg_generation_bgp_from_data(topology["routers"], args.output, args.workers)
 
 if __name__ == "__main__":
     main()
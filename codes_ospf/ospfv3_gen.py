@@ -4,20 +4,46 @@ IPv6 OSPFv3 Config Generator for GNS3 c7200 routers
 Takes a simple JSON topology and generates .cfg files with OSPFv3 configuration
 """
 
-import json
 import ipaddress
-import os
+import logging
 import sys
+from collections import defaultdict
+from pathlib import Path
+
+# JSON I/O and router-id helpers are shared with the RIP/BGP generators
+sys.path.append(str(Path(__file__).resolve().parent.parent / "codes_rip"))
+from topology_common import generate_router_id, read_json_file, write_file, write_json_file
+
+log = logging.getLogger(__name__)
+
+# Static config blocks, identical for every router: built once, not per router
+_GLOBAL_LINES = (
+    "!",
+    # Enable IPv6 unicast routing (required for OSPFv3)
+    "ipv6 unicast-routing",
+    "ipv6 cef",
+    "!",
+)
+# Interfaces with an IPv6 assignment all share these trailing lines
+_OSPF_IFACE_LINES = (
+    " ipv6 ospf 1 area 0",
+    " no shutdown",
+)
+# End with save command
+_END_LINES = (
+    "!",
+    "end",
+    "write memory",
+)
 
 def load_topology(json_file):
     """Load the topology JSON file."""
-    with open(json_file, 'r') as f:
-        return json.load(f)
+    return read_json_file(json_file)
 
 def generate_ipv6_addresses(topology):
     """
     Generate IPv6 addresses for all links based on ipv6_base.
-    Returns a dict mapping (router, interface) -> (ipv6, prefix_length)
+    Returns a dict mapping router -> {interface: (ipv6, prefix_length)}
     """
     # Parse the base IPv6 network
     ipv6_base = topology.get("ipv6_base", "2001:db8::/48")
@@ -32,21 +58,21 @@ def generate_ipv6_addresses(topology):
         sys.exit(1)
 
     # We'll assign IPv6 addresses from sequential /64 subnets using a readable numbering
-    ipv6_assignments = {}
+    ipv6_assignments = defaultdict(dict)
+    base_int = int(base_network.network_address)
+    prefix_length = 64
 
     # Process each link and create subnets like 2001:db8:1::/64, 2001:db8:2::/64, ...
     for i, link in enumerate(links, start=1):
         # Compute the ith /64 inside the base network: add i * 2^64 to the base address
-        subnet_addr = base_network.network_address + (i << 64)
-        subnet = ipaddress.ip_network(f"{subnet_addr}/64", strict=False)
+        subnet_int = base_int + (i << 64)
 
         # Assign ::1 address to router A and ::2 to router B
-        ipv6_a = str(subnet.network_address + 1)
-        ipv6_b = str(subnet.network_address + 2)
-        prefix_length = subnet.prefixlen  # 64
+        ipv6_a = str(ipaddress.IPv6Address(subnet_int + 1))
+        ipv6_b = str(ipaddress.IPv6Address(subnet_int + 2))
 
-        ipv6_assignments[(link["a"], link["a_iface"])] = (ipv6_a, prefix_length)
-        ipv6_assignments[(link["b"], link["b_iface"])] = (ipv6_b, prefix_length)
+        ipv6_assignments[link["a"]][link["a_iface"]] = (ipv6_a, prefix_length)
+        ipv6_assignments[link["b"]][link["b_iface"]] = (ipv6_b, prefix_length)
 
     # NOTE: The following block previously generated Loopback0 (/128) addresses
     # for each router and returned them along with interface addresses. Per
@@ -63,28 +89,18 @@ def generate_ipv6_addresses(topology):
 
     return ipv6_assignments
 
-def create_ospfv3_config(router_name, router_data, ipv6_assignments, topology):
+def create_ospfv3_config(router_name, router_data, router_assignments, topology):
     """
     Create OSPFv3 configuration for a single router.
-    Returns the config as a string.
+    router_assignments maps this router's interfaces to (ipv6, prefix_length).
+    Returns the config as UTF-8 encoded bytes, ready to be written.
     """
-    config_lines = []
-    
-    # 1. Basic hostname
-    config_lines.append(f"hostname {router_name}")
-    config_lines.append("!")
-    
-    # 2. Enable IPv6 unicast routing (required for OSPFv3)
-    config_lines.append("ipv6 unicast-routing")
-    config_lines.append("ipv6 cef")
-    config_lines.append("!")
+    # 1. Basic hostname, then 2. the static global block
+    config_lines = [f"hostname {router_name}"]
+    config_lines.extend(_GLOBAL_LINES)
     
     # Determine router ID early (OSPFv3 still uses 32-bit router IDs)
-    router_num = ''.join(filter(str.isdigit, router_name))
-    if router_num:
-        router_id = f"{router_num}.{router_num}.{router_num}.{router_num}"
-    else:
-        router_id = "1.1.1.1"
+    router_id = generate_router_id(router_name)
 
     # Loopback generation is intentionally disabled (preserved as commented code)
 
@@ -96,13 +112,12 @@ def create_ospfv3_config(router_name, router_data, ipv6_assignments, topology):
         config_lines.append(" no ip address")
 
         # Check if this interface has an IPv6 assignment
-        key = (router_name, interface_name)
-        if key in ipv6_assignments:
-            ipv6, prefix_length = ipv6_assignments[key]
+        assignment = router_assignments.get(interface_name)
+        if assignment:
+            ipv6, prefix_length = assignment
             config_lines.append(" ipv6 nd dad attempts 0")
             config_lines.append(f" ipv6 address {ipv6}/{prefix_length}")
-            config_lines.append(f" ipv6 ospf 1 area 0")
-            config_lines.append(" no shutdown")
+            config_lines.extend(_OSPF_IFACE_LINES)
         else:
             config_lines.append(" shutdown")
 
@@ -111,56 +126,49 @@ def create_ospfv3_config(router_name, router_data, ipv6_assignments, topology):
     # 5. OSPFv3 router stanza
     config_lines.append("ipv6 router ospf 1")
     config_lines.append(f" router-id {router_id}")
-    config_lines.append("!")
 
-    # 6. End with save command
-    config_lines.append("end")
-    config_lines.append("write memory")
+    # 6. Static trailer
+    config_lines.extend(_END_LINES)
     
-    return "\n".join(config_lines)
+    return ("\n".join(config_lines) + "\n").encode("utf-8")
 
 def generate_all_configs(topology, output_dir="configs"):
     """Generate configuration files for all routers."""
-    
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    out_dir = Path(output_dir)
     
     # Generate IPv6 addresses for all links
     print("Generating IPv6 addresses for links...")
     ipv6_assignments = generate_ipv6_addresses(topology)
-    # Print IPv6 assignments for verification
-    print("\nIPv6 Address Assignments:")
-    print("-" * 50)
-    for (router, iface), (ipv6, prefix) in ipv6_assignments.items():
-        print(f"{router}:{iface} -> {ipv6}/{prefix}")
+    # Log IPv6 assignments for verification (formatted only at DEBUG level)
+    for router, assignments in ipv6_assignments.items():
+        for iface, (ipv6, prefix) in assignments.items():
+            log.debug("%s:%s -> %s/%s", router, iface, ipv6, prefix)
     
     # Generate config for each router
-    print("\nGenerating router configurations...")
-    print("-" * 50)
+    print("Generating router configurations...")
     
-    for router_data in topology["routers"]:
+    routers = topology["routers"]
+    enabled = 0
+    for router_data in routers:
         router_name = router_data["name"]
-        print(f"Creating config for {router_name}...")
-        
-        # Generate the config
-        config = create_ospfv3_config(router_name, router_data, ipv6_assignments, topology)
+        router_assignments = ipv6_assignments.get(router_name, {})
+        config = create_ospfv3_config(router_name, router_data, router_assignments, topology)
+        # Only interfaces listed for the router get OSPFv3, not every assignment
+        router_enabled = sum(1 for interface in router_data["interfaces"]
+                             if interface["name"] in router_assignments)
+        enabled += router_enabled
         
         # Save to .cfg file
-        filename = f"{router_name}.cfg"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, "w") as f:
-            f.write(config)
+        filepath = out_dir / f"{router_name}.cfg"
         
-        print(f"  Saved to: {filepath}")
+        # write_file creates the output directory only if the first open fails
+        write_file(filepath, config)
         
-        # Display a summary of what's configured
-        print(f"  OSPFv3 interfaces enabled:")
-        for interface in router_data["interfaces"]:
-            key = (router_name, interface["name"])
-            if key in ipv6_assignments:
-                ipv6, prefix = ipv6_assignments[key]
-                print(f"    {interface['name']}: {ipv6}/{prefix}")
+        log.debug("Saved %s (%d OSPFv3 interfaces)", filepath, router_enabled)
+    
+    # Single summary instead of one block per router
+    print(f"{len(routers)} router configurations written, "
+          f"{enabled} OSPFv3 interfaces enabled")
     
     print("\n" + "=" * 60)
     print(f"Done! Configurations saved in '{output_dir}/' directory")
@@ -205,8 +213,7 @@ def create_sample_json():
         "ipv6_base": "2001:db8::/48"
     }
     
-    with open("topology_ipv6.json", "w") as f:
-        json.dump(sample, f, indent=2)
+    write_json_file(Path("topology_ipv6.json"), sample)
     
     print("Created sample topology_ipv6.json")
     return sample
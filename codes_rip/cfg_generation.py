@@ -1,21 +1,65 @@
-import json
-from jinja2 import Template
+import os
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pathlib import Path
 
-def cfg_generation(topology, ip_base):
-    with open(topology) as f:
-        topo = json.load(f)
+from topology_common import read_json_file, render_configs
 
-    routers_data = {r["name"]: r for r in topo["routers"]}
-    
-    template = Template(open("router_rip.j2").read())
-    
-    for router_name in routers_data.keys():
-        config = template.render(
-            name=router_name,
-            interfaces=routers_data[router_name]["interfaces"],
-            rip_networks=routers_data[router_name]["rip_networks"]
-        )
-        with open(f"{router_name}.cfg", "w") as f:
-            f.write(config)
+try:
+    import ijson
+except ImportError:
+    # ijson est optionnel : sans lui, le fichier est analysé d'un bloc
+    ijson = None
+
+# Au-delà de cette taille, topology.json est lu routeur par routeur (ijson)
+LARGE_TOPOLOGY_SIZE = 8 * 1024 * 1024
+
+# Le template est compilé une seule fois au chargement du module ; le cache de
+# bytecode évite de le recompiler d'une exécution à l'autre.
+_ENV = Environment(
+    loader=FileSystemLoader(Path(__file__).parent),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_TEMPLATE = _ENV.get_template("router_rip.j2")
+# Méthode liée une fois pour toutes, appelée pour chaque routeur
+_render = _TEMPLATE.render
+
+def _iter_routers(topology):
+    """
+    Itère sur les routeurs de topology.json.
+    Un gros fichier est analysé au fil de l'eau avec ijson (backend C choisi
+    automatiquement s'il est installé) : seuls les routeurs en cours de rendu
+    sont en mémoire, un à la fois en séquentiel, une fenêtre bornée avec un
+    pool (voir render_configs) ;
+    sinon le fichier est chargé d'un bloc par read_json_file, qui le projette
+    en mémoire (mmap) au-delà de quelques centaines de Ko.
+    """
+    if ijson and os.path.getsize(topology) > LARGE_TOPOLOGY_SIZE:
+        with open(topology, "rb") as f:
+            yield from ijson.items(f, "routers.item")
+        return
+    yield from read_json_file(topology)["routers"]
+
+def _render_one(router):
+    """Rend la config RIPng d'une entrée de routeur de topology.json."""
+    # Chaque entrée de routeur fournit directement le contexte du template
+    # (name, interfaces, rip_networks) : pas de ré-indexation par nom
+    return router["name"], _render(**router).encode("utf-8")
+
+def cfg_generation(topology, ip_base, output_dir=".", workers=None):
+    """Génère les configs RIPng à partir d'un fichier topology.json."""
+    cfg_generation_from_data(_iter_routers(topology), output_dir, workers=workers)
+
+def cfg_generation_from_data(routers, output_dir=".", workers=None):
+    """
+    Génère les configs RIPng à partir des routeurs déjà en mémoire
+    (ex: topology_data["routers"] renvoyé par extract_topology).
+
+    Rendu séquentiel par défaut, sur un pool de workers processus sinon
+    (voir render_configs).
+    """
+    count = render_configs(_render_one, routers, Path(output_dir), workers)
     
-    print("Configurations RIPng générées avec succès.")
+    print(f"{count} configurations RIPng générées avec succès.")
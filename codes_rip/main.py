@@ -3,9 +3,31 @@ Script principal pour générer automatiquement les configurations RIP des route
 Workflow complet : GNS3 project -> topology.json -> fichiers .cfg
 """
 
+import argparse
+import logging
 from pathlib import Path
-from cfg_generation import cfg_generation
-from get_topology import extract_topology
+from cfg_generation import cfg_generation_from_data
+from get_topology import BASE_DIR, extract_topology
+
+# Valeurs par défaut, modifiables en ligne de commande
+DEFAULT_GNS3_PROJECT = r"C:\Users\Hector\Desktop\INSA Lyon\3A-TC\S1\GNS Projet\blank_project\blank_project.gns3"
+DEFAULT_IP_BASE = "2000:1::/64"
+
+
+def parse_args():
+    """Lit les paramètres de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Génère les configurations RIPng d'un projet GNS3.")
+    parser.add_argument("--project", default=DEFAULT_GNS3_PROJECT,
+                        help="fichier .gns3 du projet")
+    parser.add_argument("--ip-base", default=DEFAULT_IP_BASE,
+                        help="premier sous-réseau IPv6 des liens (défaut: %(default)s)")
+    parser.add_argument("--output", type=Path, default=BASE_DIR,
+                        help="répertoire de sortie de topology.json et des .cfg (défaut: répertoire du script)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="rendre les configs sur N processus (défaut: rendu séquentiel)")
+    parser.add_argument("--no-json", action="store_true",
+                        help="ne pas écrire topology.json, générer les .cfg directement")
+    return parser.parse_args()
 
 
 def main():
@@ -17,14 +39,16 @@ def main():
     2. Génère topology.json avec l'adressage IP calculé
     3. Crée les fichiers .cfg pour chaque routeur avec RIP configuré
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # --- Configuration des paramètres ---
-    # Répertoire de travail : où se trouve ce script
-    base_dir = Path(__file__).parent.absolute()
-    gns3_project_file = r"C:\Users\Hector\Desktop\INSA Lyon\3A-TC\S1\GNS Projet\blank_project\blank_project.gns3"
-    ip_base = "2000:1::/64"
+    args = parse_args()
     topology_filename = "topology.json"
-    extract_topology(gns3_project_file, ip_base, base_dir, topology_filename)
-    cfg_generation(topology_filename, ip_base)
+    topology = extract_topology(args.project, args.ip_base, args.output, topology_filename,
+                                write_json=not args.no_json)
+    # Les routeurs sont passés directement : topology.json (sauf --no-json)
+    # est écrit pour consultation mais n'est pas relu
+    cfg_generation_from_data(topology["routers"], args.output, workers=args.workers)
 
 if __name__ == "__main__":
     main()
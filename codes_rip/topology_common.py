@@ -0,0 +1,267 @@
+"""
+Fonctions communes aux scripts RIP (codes_rip), BGP (codes_bgp) et OSPF
+(codes_ospf) :
+- Traduction des ports GNS3 en noms d'interfaces Cisco
+- Extraction des routeurs et des liens d'un projet GNS3
+- Allocation d'un sous-réseau IPv6 par lien
+- Lecture et écriture des fichiers JSON (projet GNS3, topologies exportées)
+  et des fichiers générés
+- Rendu et écriture des configs, séquentiel ou sur un pool de processus
+- Calcul du router-id à partir du nom du routeur
+
+Les scripts des autres répertoires (codes_bgp, codes_ospf) restent
+exécutables seuls : ils ajoutent codes_rip à sys.path, calculé depuis leur
+propre __file__, avant d'importer ce module.
+"""
+
+import ipaddress
+import json
+import logging
+import mmap
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    # orjson est optionnel : repli sur le module json standard
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Au-delà de cette taille, le fichier est projeté en mémoire plutôt que copié
+MMAP_THRESHOLD = 256 * 1024
+
+# Nombre de routeurs envoyés d'un coup à chaque processus fils
+CHUNKSIZE = 8
+
+
+def read_json_file(path):
+    """
+    Charge un fichier JSON (ex: projet .gns3).
+    Les gros fichiers sont projetés en mémoire (mmap) et analysés directement
+    par orjson, sans copie intermédiaire ; les petits sont lus d'un bloc.
+    Lève FileNotFoundError si le fichier n'existe pas.
+    """
+    with open(path, "rb") as f:
+        if orjson and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def write_json_file(path, data):
+    """
+    Écrit data en JSON indenté (2 espaces, retour à la ligne final) dans path,
+    avec orjson s'il est installé.
+    """
+    if orjson:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        raw = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    write_file(path, raw)
+
+
+def write_file(path, data):
+    """
+    Écrit data (bytes) dans path. Le répertoire parent n'est créé que s'il
+    manque, au premier échec d'ouverture, sans vérification préalable.
+    """
+    try:
+        f = open(path, "wb")
+    except FileNotFoundError:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "wb")
+    with f:
+        f.write(data)
+
+
+def _write_configs(rendered, out_dir):
+    """Écrit les configs rendues (nom, bytes) et renvoie le nombre de fichiers."""
+    count = 0
+    for router_name, data in rendered:
+        output_file = out_dir / f"{router_name}.cfg"
+        write_file(output_file, data)
+        log.debug("Config générée : %s", output_file)
+        count += 1
+    return count
+
+
+def _render_windowed(executor, render_one, items, workers):
+    """
+    Rend les éléments dans le pool par fenêtres de workers * CHUNKSIZE, dans
+    l'ordre. executor.map soumet tout son itérable d'un coup : appelé sur un
+    générateur (ex: lecture ijson), il le viderait et garderait tout en mémoire.
+    """
+    window = workers * CHUNKSIZE
+    while True:
+        batch = list(islice(items, window))
+        if not batch:
+            return
+        yield from executor.map(render_one, batch, chunksize=CHUNKSIZE)
+
+
+def render_configs(render_one, items, out_dir, workers=None):
+    """
+    Rend chaque élément avec render_one (-> (nom du routeur, config encodée))
+    et écrit out_dir/<nom>.cfg. Renvoie le nombre de fichiers générés.
+
+    Le rendu est séquentiel par défaut : un rendu Jinja coûte quelques dizaines
+    de µs par routeur, bien moins que le démarrage d'un processus fils.
+    workers=N le répartit sur un pool de N processus ; render_one doit alors
+    être une fonction de niveau module.
+    """
+    if not workers:
+        return _write_configs(map(render_one, items), out_dir)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _write_configs(_render_windowed(executor, render_one, iter(items), workers), out_dir)
+
+
+_DIGIT_RE = re.compile(r"\d+")
+
+
+def generate_router_id(router_name):
+    """
+    Génère un router-id IPv4 à partir du nom du routeur
+    Ex: R1 -> 1.1.1.1 (1.1.1.1 aussi si le nom ne contient pas de chiffre)
+    """
+    match = _DIGIT_RE.search(router_name)
+    n = int(match.group()) if match else 1
+    return f"{n}.{n}.{n}.{n}"
+
+
+# --- FONCTION UTILITAIRE : Traduction GNS3 -> Cisco ---
+def _format_interface_name(adapter, port):
+    # Sur un c7200, l'adaptateur 0 est souvent le FastEthernet intégré
+    if adapter == 0:
+        return f"FastEthernet{adapter}/{port}"
+    # Les adaptateurs suivants (1, 2...) sont souvent des modules Gigabit
+    else:
+        return f"GigabitEthernet{adapter}/{port}"
+
+
+class _InterfaceNames(dict):
+    """Table (adaptateur, port) -> nom d'interface, complétée à la demande."""
+
+    def __missing__(self, key):
+        name = self[key] = _format_interface_name(*key)
+        return name
+
+
+# Précalculée pour les cas usuels d'un c7200 (8 adaptateurs x 8 ports)
+_IFACE_NAMES = _InterfaceNames(
+    ((adapter, port), _format_interface_name(adapter, port))
+    for adapter in range(8)
+    for port in range(8)
+)
+
+
+def get_interface_name(adapter, port):
+    """
+    Traduit les numéros de port GNS3 en noms d'interfaces Cisco IOS.
+    A adapter selon le modèle de routeur (ici optimisé pour c7200).
+    """
+    return _IFACE_NAMES[(adapter, port)]
+
+
+def extract_links(nodes_data, links_data):
+    """
+    Extrait les routeurs et les liens entre routeurs connus d'un projet GNS3.
+
+    Args:
+        nodes_data (list): Nœuds du projet GNS3
+        links_data (list): Liens du projet GNS3
+
+    Returns:
+        tuple: (liste des noms de routeurs, liste des liens {"a", "a_iface", "b", "b_iface"})
+    """
+    # Création d'un dictionnaire pour retrouver le nom d'un routeur via son ID unique
+    id_to_name = {}
+    routers_list = []
+
+    for node in nodes_data:
+        name = node["name"]
+        node_id = node["node_id"]
+        id_to_name[node_id] = name
+        routers_list.append(name)
+
+    links = []
+
+    for link in links_data:
+        nodes = link["nodes"]
+        node_a_data = nodes[0]
+        node_b_data = nodes[1]
+
+        # Une seule recherche par extrémité : None si ce n'est pas un routeur connu
+        name_a = id_to_name.get(node_a_data["node_id"])
+        name_b = id_to_name.get(node_b_data["node_id"])
+
+        if name_a is not None and name_b is not None:
+            links.append({
+                "a": name_a,
+                "a_iface": get_interface_name(node_a_data["adapter_number"], node_a_data["port_number"]),
+                "b": name_b,
+                "b_iface": get_interface_name(node_b_data["adapter_number"], node_b_data["port_number"])
+            })
+
+    return routers_list, links
+
+
+def allocate_links(links, ip_base):
+    """
+    Attribue un sous-réseau à chaque lien, à partir de ip_base puis des
+    sous-réseaux suivants de même taille (::1 pour le routeur A, ::2 pour B).
+    Chaque lien reçoit aussi la clé "net" (adresse de son sous-réseau).
+
+    Args:
+        links (list): Liens {"a", "a_iface", "b", "b_iface"}
+        ip_base (str): Premier sous-réseau IPv6 (ex: "2000:1::/64")
+
+    Returns:
+        defaultdict: routeur -> liste des interfaces {"name", "ip", "prefix", "link_net"}
+    """
+    base_net = ipaddress.ip_network(ip_base)
+    interfaces_cfg = defaultdict(list)
+    # Les sous-réseaux successifs sont calculés en entiers : seul le préfixe
+    # de base est validé par ipaddress, une fois.
+    prefix = base_net.prefixlen
+    step = base_net.num_addresses
+    net_int = int(base_net.network_address)
+
+    # Les adresses des routeurs sont prises par décalage (+1, +2) sans passer
+    # par hosts() : il faut donc vérifier que le préfixe les contient.
+    if step < 4:
+        print(f"Erreur : le préfixe '{ip_base}' est trop long pour adresser les deux extrémités d'un lien.")
+        exit(1)
+
+    for link in links:
+        link_net = str(ipaddress.IPv6Address(net_int))
+
+        # Configuration pour le routeur A
+        interfaces_cfg[link["a"]].append({
+            "name": link["a_iface"],
+            "ip": str(ipaddress.IPv6Address(net_int + 1)),
+            "prefix": prefix,
+            "link_net": link_net
+        })
+
+        # Configuration pour le routeur B
+        interfaces_cfg[link["b"]].append({
+            "name": link["b_iface"],
+            "ip": str(ipaddress.IPv6Address(net_int + 2)),
+            "prefix": prefix,
+            "link_net": link_net
+        })
+
+        link["net"] = link_net
+
+        # Calcul du prochain sous-réseau
+        net_int += step
+
+    return interfaces_cfg